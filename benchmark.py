@@ -8,14 +8,21 @@ to compare their speed and throughput across various operations.
 Usage:
     python benchmark.py                          # Test Lodis only
     python benchmark.py --redis localhost:6379   # Compare with Redis server
+    python benchmark.py --redis localhost:6379 --pipeline  # Also run pipelined
 """
 
 import argparse
+import gc
+import itertools
+import math
 import time
+import timeit
 import statistics
-import sys
 import getpass
-from typing import List, Tuple, Dict, Any
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 
 try:
     import redis as redis_module
@@ -24,460 +31,852 @@ except ImportError:
 
 from lodis import Lodis
 
-
-class BenchmarkResult:
-    """Store results of a benchmark test."""
-
-    def __init__(self, name: str, operations: int):
-        self.name = name
-        self.operations = operations
-        self.lodis_time = None
-        self.redis_time = None
-        self.lodis_ops_per_sec = None
-        self.redis_ops_per_sec = None
-
-    def set_lodis_time(self, time_taken: float):
-        self.lodis_time = time_taken
-        self.lodis_ops_per_sec = self.operations / time_taken if time_taken > 0 else 0
-
-    def set_redis_time(self, time_taken: float):
-        self.redis_time = time_taken
-        self.redis_ops_per_sec = self.operations / time_taken if time_taken > 0 else 0
-
-    def get_speedup(self) -> str:
-        """Calculate speedup factor (positive means Lodis is faster)."""
-        if self.redis_time and self.lodis_time:
-            speedup = self.redis_time / self.lodis_time
-            if speedup > 1:
-                return f"{speedup:.2f}x faster"
-            else:
-                return f"{1/speedup:.2f}x slower"
+# Number of queued commands sent per pipeline flush in pipelined mode
+PIPELINE_BATCH_SIZE = 1000
+
+# Size of the Redis connection pool shared by all tests
+REDIS_MAX_CONNECTIONS = 4
+
+# Benchmark tests in run order with their default number of operations. Each
+# name maps to a PerformanceBenchmark.test_<name>_operations method.
+DEFAULT_TEST_SIZES = {
+    "SET": 10000,
+    "MSET": 10000,
+    "GET": 10000,
+    "DELETE": 5000,
+    "INCR": 10000,
+    "LPUSH": 10000,
+    "RPUSH": 10000,
+    "LPOP": 5000,
+    "LRANGE": 1000,
+    "SADD": 10000,
+    "SMEMBERS": 1000,
+    "SISMEMBER": 10000,
+    "ZADD": 10000,
+    "ZRANGE": 1000,
+    "ZSCORE": 10000,
+    "EXPIRE": 5000,
+    "EXISTS": 10000,
+    "KEYS": 100,
+}
+
+# Number of timed runs per test; the best run is reported
+DEFAULT_REPEAT = 5
+
+# Number of untimed runs per test before measuring
+DEFAULT_WARMUP = 1
+
+
+def ops_per_sec(operations: int, time_taken: float) -> float:
+    """Calculate throughput, returning 0 for a zero or missing (NaN) time."""
+    return operations / time_taken if time_taken > 0 else 0
+
+
+def select_tests(ops: List[str] = None) -> List[str]:
+    """
+    Normalize and validate benchmark test names.
+
+    Args:
+        ops: Test names in any case (e.g. ["set", "LPUSH"]), or None for all tests
+
+    Returns:
+        Upper-case test names in the given order
+
+    Raises:
+        ValueError: If ops contains a name not in DEFAULT_TEST_SIZES
+    """
+    if ops is None:
+        return list(DEFAULT_TEST_SIZES)
+    selected = [op.strip().upper() for op in ops]
+    unknown = [op for op in selected if op not in DEFAULT_TEST_SIZES]
+    if unknown:
+        raise ValueError(f"unknown operation(s): {', '.join(unknown)}")
+    return selected
+
+
+def consume(iterator):
+    """
+    Exhaust an iterator, discarding its results.
+
+    Feeding ``map(client.method, ...)`` into a zero-length deque drives the
+    calls from C, without a Python-level loop per operation.
+    """
+    deque(iterator, maxlen=0)
+
+
+def format_speedup(speedup: float) -> str:
+    """Format a Redis/Lodis time ratio (a ratio above 1 means Lodis is faster)."""
+    if not speedup > 0:  # NaN (missing time) or zero
         return "N/A"
+    factor = max(speedup, 1 / speedup)
+    return f"{factor:.2f}x {'faster' if speedup > 1 else 'slower'}"
+
+
+class BatchedPipeline:
+    """
+    Wrap a client pipeline so commands are flushed every ``batch_size`` calls.
+
+    Benchmark functions call client methods as usual; each call is queued on
+    the pipeline and the pipeline is executed once the batch is full.
+    """
+
+    def __init__(self, client, batch_size: int = PIPELINE_BATCH_SIZE):
+        self._pipe = client.pipeline(transaction=False)
+        self._batch_size = batch_size
+        self._pending = 0
+
+    def __getattr__(self, name):
+        command = getattr(self._pipe, name)
+
+        def queue(*args, **kwargs):
+            command(*args, **kwargs)
+            self._pending += 1
+            if self._pending >= self._batch_size:
+                self.execute()
+
+        return queue
+
+    def execute(self):
+        """Send all queued commands to the server."""
+        if self._pending:
+            self._pipe.execute()
+            self._pending = 0
+
+
+def batched(func):
+    """Return a variant of a benchmark function that runs through a pipeline."""
+    def run(client):
+        pipe = BatchedPipeline(client)
+        func(pipe)
+        pipe.execute()
+
+    return run
 
 
 class PerformanceBenchmark:
     """Performance benchmark suite for Redis vs Lodis."""
 
-    def __init__(self, redis_endpoint: str = None, redis_password: str = None):
+    def __init__(self, redis_endpoint: str = None, redis_password: str = None,
+                 redis_db: int = 0, pipeline: bool = False, repeat: int = DEFAULT_REPEAT,
+                 warmup: int = DEFAULT_WARMUP, parallel: bool = False):
         """
         Initialize benchmark suite.
 
         Args:
             redis_endpoint: Redis server endpoint in format "host:port" or None for Lodis-only
             redis_password: Redis server password or None for no authentication
+            redis_db: Redis database number to run in (only this database is flushed)
+            pipeline: Also run every test in pipelined (batched) mode
+            repeat: Number of timed runs per test (the best run is reported)
+            warmup: Number of untimed runs per test before measuring
+            parallel: Run the Lodis and Redis measurements of a test concurrently
         """
         self.redis_endpoint = redis_endpoint
+        self.pipeline = pipeline
+        self.repeat = max(1, repeat)
+        self.warmup = max(0, warmup)
+        self.parallel = parallel
         self.redis_client = None
         self.lodis_client = Lodis()
-        self.results: List[BenchmarkResult] = []
+
+        # Results are stored as parallel arrays, one entry per benchmark run.
+        # Missing Redis times and speedups are stored as NaN.
+        self.names: List[str] = []
+        self.units: List[str] = []
+        self.counted: List[bool] = []
+        self.ops = array("q")
+        self.lodis_times = array("d")
+        self.redis_times = array("d")
+        self.speedups = array("d")
+
+        # Running totals for the summary, updated as each result is recorded
+        self._total_ops = 0
+        self._total_lodis_time = 0.0
+        self._total_redis_ops = 0
+        self._total_redis_time = 0.0
+
+        # Progress counters for the "[n/total]" test headers
+        self._test_index = 0
+        self._test_count = len(DEFAULT_TEST_SIZES)
 
         # Connect to Redis if endpoint provided
         if redis_endpoint and redis_module:
             try:
                 host, port = redis_endpoint.split(":")
-                self.redis_client = redis_module.Redis(
-                    host=host, port=int(port), password=redis_password, decode_responses=True
+                # Replies are left as bytes (benchmarks discard them) to skip
+                # per-reply UTF-8 decoding; one pool serves the plain client,
+                # pipelines and the --parallel worker thread
+                pool = redis_module.ConnectionPool(
+                    host=host, port=int(port), password=redis_password, db=redis_db,
+                    decode_responses=False, socket_keepalive=True,
+                    health_check_interval=0, max_connections=REDIS_MAX_CONNECTIONS
                 )
+                self.redis_client = redis_module.Redis(connection_pool=pool)
                 # Test connection
                 self.redis_client.ping()
                 auth_msg = " (authenticated)" if redis_password else ""
-                print(f"✓ Connected to Redis at {redis_endpoint}{auth_msg}")
+                print(f"✓ Connected to Redis at {redis_endpoint} (db {redis_db}){auth_msg}")
             except Exception as e:
                 print(f"✗ Failed to connect to Redis: {e}")
                 self.redis_client = None
         elif redis_endpoint and not redis_module:
             print("✗ redis module not installed. Install with: pip install redis")
 
-    def run_benchmark(self, name: str, operations: int, lodis_func, redis_func=None):
+    def run_benchmark(self, name: str, operations: int, lodis_bench, redis_bench=None,
+                      lodis_setup=None, redis_setup=None, unit: str = "ops"):
         """
         Run a benchmark test.
 
+        Only the bench functions are timed. The optional setup functions run
+        against a freshly flushed client before the timer starts, so data
+        preparation does not count towards the reported throughput.
+
+        When pipelined mode is enabled and a Redis server is connected, the
+        Redis side is run a second time with commands batched through
+        ``pipeline(transaction=False)`` and reported as a separate result, so
+        per-op latency numbers stay comparable. Lodis has no pipeline, so that
+        row reuses its direct-call times and is left out of the summary totals.
+
         Args:
             name: Name of the benchmark
-            operations: Number of operations to perform
-            lodis_func: Function to test Lodis
-            redis_func: Function to test Redis (optional)
+            operations: Number of operations performed by the bench functions
+            lodis_bench: Function to test Lodis
+            redis_bench: Function to test Redis (optional)
+            lodis_setup: Untimed function preparing Lodis data (optional)
+            redis_setup: Untimed function preparing Redis data (optional)
+            unit: What ``operations`` counts. Results in any unit other than
+                "ops" (e.g. "keys" for a single bulk command) are reported
+                per that unit and left out of the summary totals.
         """
-        result = BenchmarkResult(name, operations)
+        lodis_times = self._run_single(name, operations, lodis_bench, redis_bench,
+                                       lodis_setup, redis_setup, unit=unit)
+
+        if self.pipeline and self.redis_client is not None and redis_bench is not None:
+            print(f"  -- pipelined (batch size {PIPELINE_BATCH_SIZE:,}) --")
+            self._run_single(
+                f"{name} (pipelined)",
+                operations,
+                lodis_bench,
+                batched(redis_bench),
+                lodis_setup,
+                redis_setup,
+                lodis_times=lodis_times,
+                unit=unit,
+            )
+
+    def _measure(self, client, bench, setup=None, collect: bool = True) -> List[float]:
+        """
+        Time a bench function over several runs.
 
-        # Benchmark Lodis
-        self.lodis_client.flushall()
-        start_time = time.perf_counter()
-        lodis_func(self.lodis_client)
-        lodis_time = time.perf_counter() - start_time
-        result.set_lodis_time(lodis_time)
+        Each run starts from a flushed database with the setup function applied,
+        neither of which is timed. Only the client's current database is
+        flushed, which is cheaper than FLUSHALL and leaves other Redis
+        databases untouched. ``timeit`` disables garbage collection while
+        timing, so GC pauses do not show up as noise.
+
+        Args:
+            client: Lodis or Redis client to run against
+            bench: Function to time
+            setup: Untimed function preparing data (optional)
+            collect: Run a full garbage collection before timing. Disable this
+                when another thread may be timing at the same moment.
+
+        Returns:
+            List of run times in seconds, one per repeat
+        """
+        def prepare():
+            client.flushdb()
+            if setup:
+                setup(client)
+
+        for _ in range(self.warmup):
+            prepare()
+            bench(client)
+
+        if collect:
+            gc.collect()
+        timer = timeit.Timer(lambda: bench(client), setup=prepare)
+        return timer.repeat(repeat=self.repeat, number=1)
+
+    @staticmethod
+    def _format_times(times: List[float]) -> str:
+        """Format run times as best, median and standard deviation."""
+        stdev = statistics.stdev(times) if len(times) > 1 else 0.0
+        return (f"best {min(times):.4f}s, "
+                f"median {statistics.median(times):.4f}s ± {stdev:.4f}s")
+
+    def _run_single(self, name: str, operations: int, lodis_bench, redis_bench=None,
+                    lodis_setup=None, redis_setup=None,
+                    lodis_times: List[float] = None, unit: str = "ops") -> List[float]:
+        """
+        Time one Lodis/Redis function pair and record the result.
+
+        If ``lodis_times`` is given, Lodis is not measured again; those times
+        are reused and the result is left out of the summary totals. Results
+        whose unit is not "ops" are also left out of the totals.
+
+        Returns:
+            The Lodis run times
+        """
+        run_redis = self.redis_client is not None and redis_bench is not None
+        redis_future = None
+        reused = lodis_times is not None
+
+        # Benchmark Lodis (unless reusing earlier times)
+        if reused:
+            lodis_times = list(lodis_times)
+        elif self.parallel and run_redis:
+            # Lodis is in-process and needs the GIL for its Python work, so this
+            # mostly overlaps Lodis runs with time spent waiting on Redis replies.
+            # GC state is process-wide: collect once up front and keep GC off
+            # across both measurements, so neither thread's collection or
+            # timeit's GC toggling lands inside the other's timed region.
+            gc.collect()
+            gc.disable()
+            try:
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    redis_future = executor.submit(
+                        self._measure, self.redis_client, redis_bench, redis_setup,
+                        collect=False
+                    )
+                    lodis_times = self._measure(
+                        self.lodis_client, lodis_bench, lodis_setup, collect=False
+                    )
+            finally:
+                gc.enable()
+        else:
+            lodis_times = self._measure(self.lodis_client, lodis_bench, lodis_setup)
+        lodis_time = min(lodis_times)
 
         # Benchmark Redis if available
-        if self.redis_client and redis_func:
+        redis_times = None
+        redis_time = math.nan
+        if run_redis:
             try:
-                self.redis_client.flushall()
-                start_time = time.perf_counter()
-                redis_func(self.redis_client)
-                redis_time = time.perf_counter() - start_time
-                result.set_redis_time(redis_time)
+                if redis_future is not None:
+                    redis_times = redis_future.result()
+                else:
+                    redis_times = self._measure(self.redis_client, redis_bench, redis_setup)
+                redis_time = min(redis_times)
             except Exception as e:
                 print(f"  ✗ Redis test failed: {e}")
 
-        self.results.append(result)
+        speedup = redis_time / lodis_time if lodis_time > 0 else math.nan
+        counted = not reused and unit == "ops"
+        self.names.append(name)
+        self.units.append(unit)
+        self.counted.append(counted)
+        self.ops.append(operations)
+        self.lodis_times.append(lodis_time)
+        self.redis_times.append(redis_time)
+        self.speedups.append(speedup)
+
+        if counted:
+            self._total_ops += operations
+            self._total_lodis_time += lodis_time
+            if redis_times:
+                self._total_redis_ops += operations
+                self._total_redis_time += redis_time
 
         # Print immediate result
-        print(f"  Lodis: {result.lodis_ops_per_sec:,.0f} ops/sec ({result.lodis_time:.4f}s)")
-        if result.redis_time:
-            print(f"  Redis: {result.redis_ops_per_sec:,.0f} ops/sec ({result.redis_time:.4f}s)")
-            print(f"  Result: Lodis is {result.get_speedup()}")
+        source = "direct calls, not pipelined" if reused else self._format_times(lodis_times)
+        print(f"  Lodis: {ops_per_sec(operations, lodis_time):,.0f} {unit}/sec ({source})")
+        if redis_times:
+            print(f"  Redis: {ops_per_sec(operations, redis_time):,.0f} {unit}/sec "
+                  f"({self._format_times(redis_times)})")
+            print(f"  Result: Lodis is {format_speedup(speedup)}")
+
+        return lodis_times
+
+    def _progress(self) -> str:
+        """Advance the test counter and return its "[n/total]" label."""
+        self._test_index += 1
+        return f"[{self._test_index}/{self._test_count}]"
 
     def test_set_operations(self, num_ops: int = 10000):
         """Test SET operations."""
-        print(f"\n[1/14] SET Operations ({num_ops:,} operations)")
+        print(f"\n{self._progress()} SET Operations ({num_ops:,} operations)")
+        keys = [f"key_{i}".encode() for i in range(num_ops)]
+        vals = [f"value_{i}".encode() for i in range(num_ops)]
 
         def lodis_test(client):
-            for i in range(num_ops):
-                client.set(f"key_{i}", f"value_{i}")
+            consume(map(client.set, keys, vals))
 
         def redis_test(client):
-            for i in range(num_ops):
-                client.set(f"key_{i}", f"value_{i}")
+            consume(map(client.set, keys, vals))
 
         self.run_benchmark("SET", num_ops, lodis_test, redis_test)
 
+    def test_mset_operations(self, num_ops: int = 10000):
+        """Test MSET operations (all keys written in a single bulk call)."""
+        print(f"\n{self._progress()} MSET Operations ({num_ops:,} keys)")
+        mapping = {f"key_{i}".encode(): f"value_{i}".encode() for i in range(num_ops)}
+
+        def lodis_test(client):
+            client.mset(mapping)
+
+        def redis_test(client):
+            client.mset(mapping)
+
+        # One command per run: report keys/sec and keep it out of the op totals
+        self.run_benchmark("MSET", num_ops, lodis_test, redis_test, unit="keys")
+
     def test_get_operations(self, num_ops: int = 10000):
         """Test GET operations."""
-        print(f"\n[2/14] GET Operations ({num_ops:,} operations)")
+        print(f"\n{self._progress()} GET Operations ({num_ops:,} operations)")
+        keys = [f"key_{i}".encode() for i in range(num_ops)]
+        mapping = dict(zip(keys, (f"value_{i}".encode() for i in range(num_ops))))
 
-        def lodis_test(client):
+        def lodis_setup(client):
             # Prepare data
-            for i in range(num_ops):
-                client.set(f"key_{i}", f"value_{i}")
+            client.mset(mapping)
+
+        def lodis_test(client):
             # Test GET
-            for i in range(num_ops):
-                client.get(f"key_{i}")
+            consume(map(client.get, keys))
 
-        def redis_test(client):
+        def redis_setup(client):
             # Prepare data
-            for i in range(num_ops):
-                client.set(f"key_{i}", f"value_{i}")
+            client.mset(mapping)
+
+        def redis_test(client):
             # Test GET
-            for i in range(num_ops):
-                client.get(f"key_{i}")
+            consume(map(client.get, keys))
 
-        self.run_benchmark("GET", num_ops, lodis_test, redis_test)
+        self.run_benchmark("GET", num_ops, lodis_test, redis_test,
+                           lodis_setup=lodis_setup, redis_setup=redis_setup)
 
     def test_delete_operations(self, num_ops: int = 5000):
         """Test DELETE operations."""
-        print(f"\n[3/14] DELETE Operations ({num_ops:,} operations)")
+        print(f"\n{self._progress()} DELETE Operations ({num_ops:,} operations)")
+        keys = [f"key_{i}".encode() for i in range(num_ops)]
+        vals = [f"value_{i}".encode() for i in range(num_ops)]
 
-        def lodis_test(client):
+        def lodis_setup(client):
             # Prepare data
-            for i in range(num_ops):
-                client.set(f"key_{i}", f"value_{i}")
+            _set = client.set
+            for k, v in zip(keys, vals):
+                _set(k, v)
+
+        def lodis_test(client):
             # Test DELETE
-            for i in range(num_ops):
-                client.delete(f"key_{i}")
+            _delete = client.delete
+            for k in keys:
+                _delete(k)
 
-        def redis_test(client):
+        def redis_setup(client):
             # Prepare data
-            for i in range(num_ops):
-                client.set(f"key_{i}", f"value_{i}")
+            _set = client.set
+            for k, v in zip(keys, vals):
+                _set(k, v)
+
+        def redis_test(client):
             # Test DELETE
-            for i in range(num_ops):
-                client.delete(f"key_{i}")
+            _delete = client.delete
+            for k in keys:
+                _delete(k)
 
-        self.run_benchmark("DELETE", num_ops, lodis_test, redis_test)
+        self.run_benchmark("DELETE", num_ops, lodis_test, redis_test,
+                           lodis_setup=lodis_setup, redis_setup=redis_setup)
 
     def test_incr_operations(self, num_ops: int = 10000):
         """Test INCR operations."""
-        print(f"\n[4/14] INCR Operations ({num_ops:,} operations)")
+        print(f"\n{self._progress()} INCR Operations ({num_ops:,} operations)")
 
         def lodis_test(client):
-            for i in range(num_ops):
-                client.incr("counter")
+            _incr = client.incr
+            for _ in itertools.repeat(None, num_ops):
+                _incr("counter")
 
         def redis_test(client):
-            for i in range(num_ops):
-                client.incr("counter")
+            _incr = client.incr
+            for _ in itertools.repeat(None, num_ops):
+                _incr("counter")
 
         self.run_benchmark("INCR", num_ops, lodis_test, redis_test)
 
     def test_lpush_operations(self, num_ops: int = 10000):
         """Test LPUSH operations."""
-        print(f"\n[5/14] LPUSH Operations ({num_ops:,} operations)")
+        print(f"\n{self._progress()} LPUSH Operations ({num_ops:,} operations)")
+        vals = [f"value_{i}".encode() for i in range(num_ops)]
 
         def lodis_test(client):
-            for i in range(num_ops):
-                client.lpush("mylist", f"value_{i}")
+            _lpush = client.lpush
+            for v in vals:
+                _lpush("mylist", v)
 
         def redis_test(client):
-            for i in range(num_ops):
-                client.lpush("mylist", f"value_{i}")
+            _lpush = client.lpush
+            for v in vals:
+                _lpush("mylist", v)
 
         self.run_benchmark("LPUSH", num_ops, lodis_test, redis_test)
 
     def test_rpush_operations(self, num_ops: int = 10000):
         """Test RPUSH operations."""
-        print(f"\n[6/14] RPUSH Operations ({num_ops:,} operations)")
+        print(f"\n{self._progress()} RPUSH Operations ({num_ops:,} operations)")
+        vals = [f"value_{i}".encode() for i in range(num_ops)]
 
         def lodis_test(client):
-            for i in range(num_ops):
-                client.rpush("mylist", f"value_{i}")
+            _rpush = client.rpush
+            for v in vals:
+                _rpush("mylist", v)
 
         def redis_test(client):
-            for i in range(num_ops):
-                client.rpush("mylist", f"value_{i}")
+            _rpush = client.rpush
+            for v in vals:
+                _rpush("mylist", v)
 
         self.run_benchmark("RPUSH", num_ops, lodis_test, redis_test)
 
     def test_lpop_operations(self, num_ops: int = 5000):
         """Test LPOP operations."""
-        print(f"\n[7/14] LPOP Operations ({num_ops:,} operations)")
+        print(f"\n{self._progress()} LPOP Operations ({num_ops:,} operations)")
+        vals = [f"value_{i}".encode() for i in range(num_ops)]
 
-        def lodis_test(client):
+        def lodis_setup(client):
             # Prepare data
-            for i in range(num_ops):
-                client.rpush("mylist", f"value_{i}")
+            _rpush = client.rpush
+            for v in vals:
+                _rpush("mylist", v)
+
+        def lodis_test(client):
             # Test LPOP
-            for i in range(num_ops):
-                client.lpop("mylist")
+            _lpop = client.lpop
+            for _ in itertools.repeat(None, num_ops):
+                _lpop("mylist")
 
-        def redis_test(client):
+        def redis_setup(client):
             # Prepare data
-            for i in range(num_ops):
-                client.rpush("mylist", f"value_{i}")
+            _rpush = client.rpush
+            for v in vals:
+                _rpush("mylist", v)
+
+        def redis_test(client):
             # Test LPOP
-            for i in range(num_ops):
-                client.lpop("mylist")
+            _lpop = client.lpop
+            for _ in itertools.repeat(None, num_ops):
+                _lpop("mylist")
 
-        self.run_benchmark("LPOP", num_ops, lodis_test, redis_test)
+        self.run_benchmark("LPOP", num_ops, lodis_test, redis_test,
+                           lodis_setup=lodis_setup, redis_setup=redis_setup)
 
     def test_lrange_operations(self, num_ops: int = 1000):
         """Test LRANGE operations."""
-        print(f"\n[8/14] LRANGE Operations ({num_ops:,} operations, 1000 items)")
+        print(f"\n{self._progress()} LRANGE Operations ({num_ops:,} operations, 1000 items)")
+        vals = [f"value_{i}".encode() for i in range(1000)]
 
-        def lodis_test(client):
+        def lodis_setup(client):
             # Prepare data
-            for i in range(1000):
-                client.rpush("mylist", f"value_{i}")
+            _rpush = client.rpush
+            for v in vals:
+                _rpush("mylist", v)
+
+        def lodis_test(client):
             # Test LRANGE
-            for i in range(num_ops):
-                client.lrange("mylist", 0, 99)
+            _lrange = client.lrange
+            for _ in itertools.repeat(None, num_ops):
+                _lrange("mylist", 0, 99)
 
-        def redis_test(client):
+        def redis_setup(client):
             # Prepare data
-            for i in range(1000):
-                client.rpush("mylist", f"value_{i}")
+            _rpush = client.rpush
+            for v in vals:
+                _rpush("mylist", v)
+
+        def redis_test(client):
             # Test LRANGE
-            for i in range(num_ops):
-                client.lrange("mylist", 0, 99)
+            _lrange = client.lrange
+            for _ in itertools.repeat(None, num_ops):
+                _lrange("mylist", 0, 99)
 
-        self.run_benchmark("LRANGE", num_ops, lodis_test, redis_test)
+        self.run_benchmark("LRANGE", num_ops, lodis_test, redis_test,
+                           lodis_setup=lodis_setup, redis_setup=redis_setup)
 
     def test_sadd_operations(self, num_ops: int = 10000):
         """Test SADD operations."""
-        print(f"\n[9/14] SADD Operations ({num_ops:,} operations)")
+        print(f"\n{self._progress()} SADD Operations ({num_ops:,} operations)")
+        members = [f"member_{i}".encode() for i in range(num_ops)]
 
         def lodis_test(client):
-            for i in range(num_ops):
-                client.sadd("myset", f"member_{i}")
+            _sadd = client.sadd
+            for m in members:
+                _sadd("myset", m)
 
         def redis_test(client):
-            for i in range(num_ops):
-                client.sadd("myset", f"member_{i}")
+            _sadd = client.sadd
+            for m in members:
+                _sadd("myset", m)
 
         self.run_benchmark("SADD", num_ops, lodis_test, redis_test)
 
     def test_smembers_operations(self, num_ops: int = 1000):
         """Test SMEMBERS operations."""
-        print(f"\n[10/14] SMEMBERS Operations ({num_ops:,} operations, 1000 members)")
+        print(f"\n{self._progress()} SMEMBERS Operations ({num_ops:,} operations, 1000 members)")
+        members = [f"member_{i}".encode() for i in range(1000)]
 
-        def lodis_test(client):
+        def lodis_setup(client):
             # Prepare data
-            for i in range(1000):
-                client.sadd("myset", f"member_{i}")
+            _sadd = client.sadd
+            for m in members:
+                _sadd("myset", m)
+
+        def lodis_test(client):
             # Test SMEMBERS
-            for i in range(num_ops):
-                client.smembers("myset")
+            _smembers = client.smembers
+            for _ in itertools.repeat(None, num_ops):
+                _smembers("myset")
 
-        def redis_test(client):
+        def redis_setup(client):
             # Prepare data
-            for i in range(1000):
-                client.sadd("myset", f"member_{i}")
+            _sadd = client.sadd
+            for m in members:
+                _sadd("myset", m)
+
+        def redis_test(client):
             # Test SMEMBERS
-            for i in range(num_ops):
-                client.smembers("myset")
+            _smembers = client.smembers
+            for _ in itertools.repeat(None, num_ops):
+                _smembers("myset")
 
-        self.run_benchmark("SMEMBERS", num_ops, lodis_test, redis_test)
+        self.run_benchmark("SMEMBERS", num_ops, lodis_test, redis_test,
+                           lodis_setup=lodis_setup, redis_setup=redis_setup)
 
     def test_sismember_operations(self, num_ops: int = 10000):
         """Test SISMEMBER operations."""
-        print(f"\n[11/17] SISMEMBER Operations ({num_ops:,} operations)")
+        print(f"\n{self._progress()} SISMEMBER Operations ({num_ops:,} operations)")
+        members = [f"member_{i}".encode() for i in range(1000)]
+        lookups = [f"member_{i % 1000}".encode() for i in range(num_ops)]
 
-        def lodis_test(client):
+        def lodis_setup(client):
             # Prepare data
-            for i in range(1000):
-                client.sadd("myset", f"member_{i}")
+            _sadd = client.sadd
+            for m in members:
+                _sadd("myset", m)
+
+        def lodis_test(client):
             # Test SISMEMBER
-            for i in range(num_ops):
-                client.sismember("myset", f"member_{i % 1000}")
+            _sismember = client.sismember
+            for m in lookups:
+                _sismember("myset", m)
 
-        def redis_test(client):
+        def redis_setup(client):
             # Prepare data
-            for i in range(1000):
-                client.sadd("myset", f"member_{i}")
+            _sadd = client.sadd
+            for m in members:
+                _sadd("myset", m)
+
+        def redis_test(client):
             # Test SISMEMBER
-            for i in range(num_ops):
-                client.sismember("myset", f"member_{i % 1000}")
+            _sismember = client.sismember
+            for m in lookups:
+                _sismember("myset", m)
 
-        self.run_benchmark("SISMEMBER", num_ops, lodis_test, redis_test)
+        self.run_benchmark("SISMEMBER", num_ops, lodis_test, redis_test,
+                           lodis_setup=lodis_setup, redis_setup=redis_setup)
 
     def test_zadd_operations(self, num_ops: int = 10000):
         """Test ZADD operations."""
-        print(f"\n[12/17] ZADD Operations ({num_ops:,} operations)")
+        print(f"\n{self._progress()} ZADD Operations ({num_ops:,} operations)")
+        mappings = [{f"member_{i}".encode(): i} for i in range(num_ops)]
 
         def lodis_test(client):
-            for i in range(num_ops):
-                client.zadd("myzset", {f"member_{i}": i})
+            _zadd = client.zadd
+            for mapping in mappings:
+                _zadd("myzset", mapping)
 
         def redis_test(client):
-            for i in range(num_ops):
-                client.zadd("myzset", {f"member_{i}": i})
+            _zadd = client.zadd
+            for mapping in mappings:
+                _zadd("myzset", mapping)
 
         self.run_benchmark("ZADD", num_ops, lodis_test, redis_test)
 
     def test_zrange_operations(self, num_ops: int = 1000):
         """Test ZRANGE operations."""
-        print(f"\n[13/17] ZRANGE Operations ({num_ops:,} operations, 1000 members)")
+        print(f"\n{self._progress()} ZRANGE Operations ({num_ops:,} operations, 1000 members)")
+        mappings = [{f"member_{i}".encode(): i} for i in range(1000)]
 
-        def lodis_test(client):
+        def lodis_setup(client):
             # Prepare data
-            for i in range(1000):
-                client.zadd("myzset", {f"member_{i}": i})
+            _zadd = client.zadd
+            for mapping in mappings:
+                _zadd("myzset", mapping)
+
+        def lodis_test(client):
             # Test ZRANGE
-            for i in range(num_ops):
-                client.zrange("myzset", 0, 99)
+            _zrange = client.zrange
+            for _ in itertools.repeat(None, num_ops):
+                _zrange("myzset", 0, 99)
 
-        def redis_test(client):
+        def redis_setup(client):
             # Prepare data
-            for i in range(1000):
-                client.zadd("myzset", {f"member_{i}": i})
+            _zadd = client.zadd
+            for mapping in mappings:
+                _zadd("myzset", mapping)
+
+        def redis_test(client):
             # Test ZRANGE
-            for i in range(num_ops):
-                client.zrange("myzset", 0, 99)
+            _zrange = client.zrange
+            for _ in itertools.repeat(None, num_ops):
+                _zrange("myzset", 0, 99)
 
-        self.run_benchmark("ZRANGE", num_ops, lodis_test, redis_test)
+        self.run_benchmark("ZRANGE", num_ops, lodis_test, redis_test,
+                           lodis_setup=lodis_setup, redis_setup=redis_setup)
 
     def test_zscore_operations(self, num_ops: int = 10000):
         """Test ZSCORE operations."""
-        print(f"\n[14/17] ZSCORE Operations ({num_ops:,} operations)")
+        print(f"\n{self._progress()} ZSCORE Operations ({num_ops:,} operations)")
+        mappings = [{f"member_{i}".encode(): i} for i in range(1000)]
+        lookups = [f"member_{i % 1000}".encode() for i in range(num_ops)]
 
-        def lodis_test(client):
+        def lodis_setup(client):
             # Prepare data
-            for i in range(1000):
-                client.zadd("myzset", {f"member_{i}": i})
+            _zadd = client.zadd
+            for mapping in mappings:
+                _zadd("myzset", mapping)
+
+        def lodis_test(client):
             # Test ZSCORE
-            for i in range(num_ops):
-                client.zscore("myzset", f"member_{i % 1000}")
+            _zscore = client.zscore
+            for m in lookups:
+                _zscore("myzset", m)
 
-        def redis_test(client):
+        def redis_setup(client):
             # Prepare data
-            for i in range(1000):
-                client.zadd("myzset", {f"member_{i}": i})
+            _zadd = client.zadd
+            for mapping in mappings:
+                _zadd("myzset", mapping)
+
+        def redis_test(client):
             # Test ZSCORE
-            for i in range(num_ops):
-                client.zscore("myzset", f"member_{i % 1000}")
+            _zscore = client.zscore
+            for m in lookups:
+                _zscore("myzset", m)
 
-        self.run_benchmark("ZSCORE", num_ops, lodis_test, redis_test)
+        self.run_benchmark("ZSCORE", num_ops, lodis_test, redis_test,
+                           lodis_setup=lodis_setup, redis_setup=redis_setup)
 
     def test_expire_operations(self, num_ops: int = 5000):
         """Test EXPIRE operations."""
-        print(f"\n[15/17] EXPIRE Operations ({num_ops:,} operations)")
+        print(f"\n{self._progress()} EXPIRE Operations ({num_ops:,} operations)")
+        keys = [f"key_{i}".encode() for i in range(num_ops)]
+        mapping = dict(zip(keys, (f"value_{i}".encode() for i in range(num_ops))))
 
-        def lodis_test(client):
+        def lodis_setup(client):
             # Prepare data
-            for i in range(num_ops):
-                client.set(f"key_{i}", f"value_{i}")
+            client.mset(mapping)
+
+        def lodis_test(client):
             # Test EXPIRE
-            for i in range(num_ops):
-                client.expire(f"key_{i}", 300)
+            _expire = client.expire
+            for k in keys:
+                _expire(k, 300)
 
-        def redis_test(client):
+        def redis_setup(client):
             # Prepare data
-            for i in range(num_ops):
-                client.set(f"key_{i}", f"value_{i}")
+            client.mset(mapping)
+
+        def redis_test(client):
             # Test EXPIRE
-            for i in range(num_ops):
-                client.expire(f"key_{i}", 300)
+            _expire = client.expire
+            for k in keys:
+                _expire(k, 300)
 
-        self.run_benchmark("EXPIRE", num_ops, lodis_test, redis_test)
+        self.run_benchmark("EXPIRE", num_ops, lodis_test, redis_test,
+                           lodis_setup=lodis_setup, redis_setup=redis_setup)
 
     def test_exists_operations(self, num_ops: int = 10000):
         """Test EXISTS operations."""
-        print(f"\n[16/17] EXISTS Operations ({num_ops:,} operations)")
+        print(f"\n{self._progress()} EXISTS Operations ({num_ops:,} operations)")
+        keys = [f"key_{i}".encode() for i in range(num_ops)]
+        mapping = dict(zip(keys, (f"value_{i}".encode() for i in range(num_ops // 2))))
+
+        def lodis_setup(client):
+            # Prepare data (only half of the keys exist)
+            # MSET needs at least one pair; with num_ops == 1 no keys exist
+            if mapping:
+                client.mset(mapping)
 
         def lodis_test(client):
-            # Prepare data
-            for i in range(num_ops // 2):
-                client.set(f"key_{i}", f"value_{i}")
             # Test EXISTS
-            for i in range(num_ops):
-                client.exists(f"key_{i}")
+            _exists = client.exists
+            for k in keys:
+                _exists(k)
+
+        def redis_setup(client):
+            # Prepare data (only half of the keys exist)
+            # MSET needs at least one pair; with num_ops == 1 no keys exist
+            if mapping:
+                client.mset(mapping)
 
         def redis_test(client):
-            # Prepare data
-            for i in range(num_ops // 2):
-                client.set(f"key_{i}", f"value_{i}")
             # Test EXISTS
-            for i in range(num_ops):
-                client.exists(f"key_{i}")
+            _exists = client.exists
+            for k in keys:
+                _exists(k)
 
-        self.run_benchmark("EXISTS", num_ops, lodis_test, redis_test)
+        self.run_benchmark("EXISTS", num_ops, lodis_test, redis_test,
+                           lodis_setup=lodis_setup, redis_setup=redis_setup)
 
     def test_keys_operations(self, num_ops: int = 100):
         """Test KEYS operations."""
-        print(f"\n[17/17] KEYS Operations ({num_ops:,} operations, 1000 keys)")
+        print(f"\n{self._progress()} KEYS Operations ({num_ops:,} operations, 1000 keys)")
+        keys = [f"key_{i}".encode() for i in range(1000)]
+        vals = [f"value_{i}".encode() for i in range(1000)]
 
-        def lodis_test(client):
+        def lodis_setup(client):
             # Prepare data
-            for i in range(1000):
-                client.set(f"key_{i}", f"value_{i}")
+            _set = client.set
+            for k, v in zip(keys, vals):
+                _set(k, v)
+
+        def lodis_test(client):
             # Test KEYS
-            for i in range(num_ops):
-                client.keys("key_*")
+            _keys = client.keys
+            for _ in itertools.repeat(None, num_ops):
+                _keys(b"key_*")
 
-        def redis_test(client):
+        def redis_setup(client):
             # Prepare data
-            for i in range(1000):
-                client.set(f"key_{i}", f"value_{i}")
+            _set = client.set
+            for k, v in zip(keys, vals):
+                _set(k, v)
+
+        def redis_test(client):
             # Test KEYS
-            for i in range(num_ops):
-                client.keys("key_*")
+            _keys = client.keys
+            for _ in itertools.repeat(None, num_ops):
+                _keys(b"key_*")
 
-        self.run_benchmark("KEYS", num_ops, lodis_test, redis_test)
+        self.run_benchmark("KEYS", num_ops, lodis_test, redis_test,
+                           lodis_setup=lodis_setup, redis_setup=redis_setup)
+
+    def run_all_tests(self, ops: List[str] = None, size: int = None):
+        """
+        Run benchmark tests.
+
+        Args:
+            ops: Names of the tests to run (e.g. ["SET", "LPUSH"]), or None for all
+            size: Number of operations for every test, or None for each test's default
+
+        Raises:
+            ValueError: If ops contains an unknown test name
+        """
+        selected = select_tests(ops)
 
-    def run_all_tests(self):
-        """Run all benchmark tests."""
         print("\n" + "=" * 70)
         print("PERFORMANCE BENCHMARK: Redis vs Lodis")
         print("=" * 70)
 
+        self._test_index = 0
+        self._test_count = len(selected)
         start_time = time.perf_counter()
 
-        # Run all tests - Strings, Lists, Sets, Sorted Sets
-        self.test_set_operations(10000)
-        self.test_get_operations(10000)
-        self.test_delete_operations(5000)
-        self.test_incr_operations(10000)
-        self.test_lpush_operations(10000)
-        self.test_rpush_operations(10000)
-        self.test_lpop_operations(5000)
-        self.test_lrange_operations(1000)
-        self.test_sadd_operations(10000)
-        self.test_smembers_operations(1000)
-        self.test_sismember_operations(10000)
-        self.test_zadd_operations(10000)
-        self.test_zrange_operations(1000)
-        self.test_zscore_operations(10000)
-        self.test_expire_operations(5000)
-        self.test_exists_operations(10000)
-        self.test_keys_operations(100)
+        # Run selected tests - Strings, Lists, Sets, Sorted Sets
+        for op in selected:
+            test = getattr(self, f"test_{op.lower()}_operations")
+            test(size or DEFAULT_TEST_SIZES[op])
 
         total_time = time.perf_counter() - start_time
 
@@ -491,37 +890,45 @@ class PerformanceBenchmark:
         print("=" * 70)
 
         # Table header
-        print(f"\n{'Operation':<20} {'Lodis (ops/s)':<20} {'Redis (ops/s)':<20} {'Result':<15}")
-        print("-" * 75)
+        print(f"\n{'Operation':<24} {'Lodis (ops/s)':<20} {'Redis (ops/s)':<20} {'Result':<15}")
+        print("-" * 79)
 
         # Table rows
-        for result in self.results:
-            lodis_ops = f"{result.lodis_ops_per_sec:,.0f}" if result.lodis_ops_per_sec else "N/A"
-            redis_ops = f"{result.redis_ops_per_sec:,.0f}" if result.redis_ops_per_sec else "N/A"
-            speedup = result.get_speedup() if result.redis_time else "N/A"
+        rows = zip(self.names, self.units, self.ops, self.lodis_times,
+                   self.redis_times, self.speedups)
+        for name, unit, operations, lodis_time, redis_time, speedup in rows:
+            lodis_rate = ops_per_sec(operations, lodis_time)
+            redis_rate = ops_per_sec(operations, redis_time)
+            suffix = "" if unit == "ops" else f" {unit}/s"
+            lodis_ops = f"{lodis_rate:,.0f}{suffix}" if lodis_rate else "N/A"
+            redis_ops = f"{redis_rate:,.0f}{suffix}" if redis_rate else "N/A"
+
+            print(f"{name:<24} {lodis_ops:<20} {redis_ops:<20} {format_speedup(speedup):<15}")
 
-            print(f"{result.name:<20} {lodis_ops:<20} {redis_ops:<20} {speedup:<15}")
+        if not all(self.counted):
+            print("\nRows in other units (e.g. keys/s) and pipelined rows are not "
+                  "included in the statistics.")
 
         # Overall statistics
         print("\n" + "=" * 70)
         print("STATISTICS")
         print("=" * 70)
 
-        total_lodis_ops = sum(r.operations for r in self.results)
-        lodis_total_time = sum(r.lodis_time for r in self.results if r.lodis_time)
+        total_lodis_ops = self._total_ops
+        lodis_total_time = self._total_lodis_time
+        total_redis_ops = self._total_redis_ops
+        redis_total_time = self._total_redis_time
         lodis_avg_ops = total_lodis_ops / lodis_total_time if lodis_total_time > 0 else 0
 
-        print(f"\nLodis:")
+        print("\nLodis:")
         print(f"  Total operations: {total_lodis_ops:,}")
         print(f"  Total time: {lodis_total_time:.4f}s")
         print(f"  Average throughput: {lodis_avg_ops:,.0f} ops/sec")
 
-        if any(r.redis_time for r in self.results):
-            total_redis_ops = sum(r.operations for r in self.results if r.redis_time)
-            redis_total_time = sum(r.redis_time for r in self.results if r.redis_time)
+        if total_redis_ops:
             redis_avg_ops = total_redis_ops / redis_total_time if redis_total_time > 0 else 0
 
-            print(f"\nRedis:")
+            print("\nRedis:")
             print(f"  Total operations: {total_redis_ops:,}")
             print(f"  Total time: {redis_total_time:.4f}s")
             print(f"  Average throughput: {redis_avg_ops:,.0f} ops/sec")
@@ -549,6 +956,11 @@ Examples:
   python benchmark.py --redis localhost:6379             # Compare with Redis server
   python benchmark.py --redis localhost:6379 --redis-password mypassword  # With authentication
   python benchmark.py --redis localhost:6379 --redis-password  # Prompt for password
+  python benchmark.py --redis localhost:6379 --redis-db 15  # Use (and flush) db 15 only
+  python benchmark.py --redis localhost:6379 --pipeline  # Also run pipelined tests
+  python benchmark.py --repeat 10                        # Best of 10 runs per test
+  python benchmark.py --redis localhost:6379 --parallel  # Time Lodis and Redis concurrently
+  python benchmark.py --ops SET,GET,LPUSH --size 50000   # Run a subset with custom size
         """
     )
 
@@ -568,8 +980,68 @@ Examples:
         help="Redis server password. If flag is provided without value, will prompt for password."
     )
 
+    parser.add_argument(
+        "--redis-db",
+        type=int,
+        default=0,
+        help="Redis database number to run in; it is flushed before each test (default: 0)"
+    )
+
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Also run each test with commands batched through a pipeline "
+             f"({PIPELINE_BATCH_SIZE} commands per flush)"
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"Number of timed runs per test; the best run is reported (default: {DEFAULT_REPEAT})"
+    )
+
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Run the Lodis and Redis side of each test concurrently to shorten the "
+             "suite; Lodis numbers may be lower due to GIL contention, and garbage "
+             "collection stays off for the whole test, including warmup and setup"
+    )
+
+    parser.add_argument(
+        "--ops",
+        type=str,
+        default=None,
+        help="Comma-separated tests to run (default: all). "
+             f"Available: {','.join(DEFAULT_TEST_SIZES)}"
+    )
+
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=None,
+        help="Number of operations for every selected test (default: per-test size)"
+    )
+
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=DEFAULT_WARMUP,
+        help=f"Number of untimed runs per test before measuring (default: {DEFAULT_WARMUP})"
+    )
+
     args = parser.parse_args()
 
+    ops = None
+    if args.ops:
+        try:
+            ops = select_tests([op for op in args.ops.split(",") if op.strip()])
+        except ValueError as e:
+            parser.error(f"--ops: {e}")
+    if args.size is not None and args.size < 1:
+        parser.error("--size must be at least 1")
+
     # Handle password prompting
     redis_password = None
     if args.redis_password == "__prompt__":
@@ -580,8 +1052,12 @@ Examples:
         redis_password = args.redis_password
 
     # Run benchmark
-    benchmark = PerformanceBenchmark(redis_endpoint=args.redis, redis_password=redis_password)
-    benchmark.run_all_tests()
+    benchmark = PerformanceBenchmark(
+        redis_endpoint=args.redis, redis_password=redis_password, redis_db=args.redis_db,
+        pipeline=args.pipeline, repeat=args.repeat, warmup=args.warmup,
+        parallel=args.parallel
+    )
+    benchmark.run_all_tests(ops=ops, size=args.size)
 
 
 if __name__ == "__main__":
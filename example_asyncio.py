@@ -1,10 +1,17 @@
 """
 Example script demonstrating asyncio support in lodis.
+
+If uvloop is installed (pip install "lodis[uvloop]"), it is used as the event loop.
 """
 
 import asyncio
 import lodis.asyncio as lodis
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 
 async def main():
     print("=== Lodis Asyncio Example ===\n")
@@ -51,30 +58,47 @@ async def main():
 
     # Concurrent operations
     print("\n6. Concurrent Operations:")
+    loop = asyncio.get_running_loop()
+    pairs = [(f"key{i}", f"value{i}") for i in range(1, 6)]
     print("   Setting 5 keys concurrently...")
-    start = asyncio.get_event_loop().time()
-    await asyncio.gather(
-        r.set("key1", "value1"),
-        r.set("key2", "value2"),
-        r.set("key3", "value3"),
-        r.set("key4", "value4"),
-        r.set("key5", "value5"),
-    )
+    start = loop.time()
+    await asyncio.gather(*(r.set(k, v) for k, v in pairs))
 
     print("   Getting 5 keys concurrently...")
-    values = await asyncio.gather(
-        r.get("key1"),
-        r.get("key2"),
-        r.get("key3"),
-        r.get("key4"),
-        r.get("key5"),
-    )
-    end = asyncio.get_event_loop().time()
+    values = await asyncio.gather(*(r.get(k) for k, _ in pairs))
+    end = loop.time()
     print(f"   Values: {values}")
     print(f"   Time taken: {(end - start) * 1000:.2f}ms")
 
+    # Bulk operations
+    print("\n7. Bulk Operations:")
+    num_bulk = 10000
+    bulk = {f"bulk_{i}": str(i) for i in range(num_bulk)}
+
+    start = loop.time()
+    for k, v in bulk.items():
+        await r.set(k, v)
+    print(f"   Sequential SET: {num_bulk / (loop.time() - start):,.0f} ops/sec")
+
+    # Lodis runs in-process, so concurrency only adds task overhead here; against
+    # a network server it overlaps round-trips. Limit the commands in flight.
+    sem = asyncio.Semaphore(100)
+
+    async def bounded(coro):
+        async with sem:
+            return await coro
+
+    start = loop.time()
+    await asyncio.gather(*(bounded(r.set(k, v)) for k, v in bulk.items()))
+    print(f"   Concurrent SET (100 in flight): {num_bulk / (loop.time() - start):,.0f} ops/sec")
+
+    start = loop.time()
+    await r.mset(bulk)
+    print(f"   Single MSET: {num_bulk / (loop.time() - start):,.0f} keys/sec")
+    await r.delete(*bulk)
+
     # Database operations
-    print("\n7. Database Operations:")
+    print("\n8. Database Operations:")
     await r.set("db0_key", "value in db 0")
     await r.select(1)
     await r.set("db1_key", "value in db 1")
@@ -84,7 +108,7 @@ async def main():
     print(f"   Back to db 0: {await r.get('db0_key')}")
 
     # Expiration
-    print("\n8. Expiration:")
+    print("\n9. Expiration:")
     await r.set("temp_key", "temporary", ex=2)
     print(f"   TTL: {await r.ttl('temp_key')} seconds")
     print("   Waiting 2.5 seconds...")
@@ -96,4 +120,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())